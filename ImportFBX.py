@@ -14,10 +14,16 @@ NOT overwrite it.
 
 Finally, this script will not import any associated materials or textures. The
 imported assets will be imported as static meshes only.
+
+All of the import tasks are handed to Unreal Engine in a single call and run 
+on the editor. Splitting them across several headless editor processes is not
+attempted, since each process would need to load and save into the same 
+project at once.
 """
 
 import unreal
 import os
+import glob
 from pathlib import Path
 
 tasks = []
@@ -28,26 +34,30 @@ fbx_directory = str(Path(str(Path.home()) + "/fbx_files/"))
 # Change the below directory path to where the unreal assets should be imported
 unreal_asset_directory = "/Game/"
 
-for fbx_file in os.listdir(fbx_directory):
+# List the existing assets once, rather than querying the asset registry for 
+# every file. Registry package paths have no trailing slash.
+asset_registry = unreal.AssetRegistryHelpers().get_asset_registry()
+existing_assets = {str(asset.asset_name) for asset in asset_registry.get_assets_by_path(unreal_asset_directory.rstrip('/'), recursive=False)}
+
+for fbx_path in glob.glob(os.path.join(fbx_directory, '*.fbx')):
+    fbx_file = os.path.basename(fbx_path)
     unreal.log("Creating Asset Import Task for file %s" % fbx_file)
-    if fbx_file.split('.')[-1]=='fbx':
-        asset_path = unreal_asset_directory + fbx_file[:-4]
-        if unreal.EditorAssetLibrary.does_asset_exist(asset_path): 
-            unreal.log("Specified asset already exists. Skipping file.")
-            unreal.log("Current asset will not be altered.")
-        else:
-            task = unreal.AssetImportTask()
-            task.filename = str(Path(fbx_directory + "\\" + fbx_file))
-            task.destination_path = unreal_asset_directory
-            task.replace_existing = False
-            task.automated = True
-            task.save = True
-            task.options = unreal.FbxImportUI()
-            task.options.import_materials = False
-            task.options.import_textures = False
-            task.options.import_as_skeletal = False
-            task.options.mesh_type_to_import = unreal.FBXImportType.FBXIT_STATIC_MESH 
-            tasks.append(task)
+    if fbx_file[:-4] in existing_assets: 
+        unreal.log("Specified asset already exists. Skipping file.")
+        unreal.log("Current asset will not be altered.")
+    else:
+        task = unreal.AssetImportTask()
+        task.filename = fbx_path
+        task.destination_path = unreal_asset_directory
+        task.replace_existing = False
+        task.automated = True
+        task.save = True
+        task.options = unreal.FbxImportUI()
+        task.options.import_materials = False
+        task.options.import_textures = False
+        task.options.import_as_skeletal = False
+        task.options.mesh_type_to_import = unreal.FBXImportType.FBXIT_STATIC_MESH 
+        tasks.append(task)
 
 if len(tasks) > 0:
     unreal.AssetToolsHelpers.get_asset_tools().import_asset_tasks(tasks)
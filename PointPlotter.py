@@ -34,7 +34,8 @@ Then Pandas can be installed by running the following in a command window:
 "C:\\Program Files\\Epic Games\\UE_5.1\\Engine\\Binaries\\ThirdParty\\Python3\\Win64\\python.exe" -m pip install pandas
 
 - Matplotlib is also required and can be installed using the same command as 
-above but replacing pandas for matplotlib
+above but replacing pandas for matplotlib. This also installs Pillow, which is
+used to draw the legend texture.
 
 """
 
@@ -47,22 +48,30 @@ import csv
 import unreal
 import pandas as pd
 import matplotlib
-import matplotlib.pyplot as plt
+import matplotlib.font_manager
 import numpy as np
+from PIL import Image, ImageDraw, ImageFont
+
+# Create the editor level library wrapper once and reuse it for every spawn
+EDITOR_LEVEL_LIBRARY = unreal.EditorLevelLibrary()
 
 class UnrealPoint:
     """
     A simple class to spawn a default unreal object and assign various 
     properties that affect its visible characteristics.
     """
+
+    # Blueprint classes already loaded, keyed by their path in the content 
+    # browser. Shared by all points.
+    _blueprint_cache = {}
     
-    def __init__(self, id: int, x:float, y:float, z:float, label_prefix:str, scale:float):
+    def __init__(self, id: int, x:float, y:float, z:float, label_prefix:str, scale:float = 1.0):
 
         self.id = id
         self.x = x
         self.y = y
         self.z = z
-        self.location = unreal.Vector(self.x, self.y, self.z)
+        self.location = unreal.Vector(x, y, z)
 
         self.scale = scale
         self.shape = 'Sphere' # Options for shape are: 'Cube', 'Sphere', 'Cylinder', 'Cone'
@@ -73,10 +82,23 @@ class UnrealPoint:
         self.actor_label = label_prefix + str(id)
 
 
+    @classmethod
+    def load_blueprint_class(cls, unreal_blueprint_path:str):
+
+        if unreal_blueprint_path not in cls._blueprint_cache:
+            cls._blueprint_cache[unreal_blueprint_path] = unreal.EditorAssetLibrary.load_blueprint_class(unreal_blueprint_path)
+        return cls._blueprint_cache[unreal_blueprint_path]
+
+
     def spawn_actor_from_blueprint_class(self, unreal_blueprint_path:str):
 
-        self.blueprint_class = unreal.EditorAssetLibrary.load_blueprint_class(unreal_blueprint_path)
-        self.actor = unreal.EditorLevelLibrary().spawn_actor_from_class(self.blueprint_class, location=self.location)
+        return self.spawn_actor_from_class(UnrealPoint.load_blueprint_class(unreal_blueprint_path))
+
+
+    def spawn_actor_from_class(self, blueprint_class):
+
+        self.blueprint_class = blueprint_class
+        self.actor = EDITOR_LEVEL_LIBRARY.spawn_actor_from_class(self.blueprint_class, location=self.location)
         
         # Some actor attributes only become available when the actor is spawned
         # These are added here. All options available at: 
@@ -93,6 +115,38 @@ class UnrealPoint:
         return self.actor.get_name()
 
 
+def spawn_points_from_blueprint_class(points, unreal_blueprint_path:str):
+    """
+    Spawn a batch of UnrealPoint objects from the same blueprint class.
+
+    The blueprint class is loaded once and the spawns are
+    grouped into a single editor transaction with viewport realtime rendering
+    switched off, so the level viewport is redrawn once rather than after 
+    every actor. Returns the list of spawned actor names, in the same order as
+    points.
+    """
+    blueprint_class = UnrealPoint.load_blueprint_class(unreal_blueprint_path)
+    
+    # Not every engine version exposes the realtime toggle to Python, so only
+    # use it where it is available.
+    level_editor = unreal.get_editor_subsystem(unreal.LevelEditorSubsystem)
+    set_realtime = getattr(level_editor, 'set_level_viewport_realtime', None)
+    if set_realtime is not None:
+        set_realtime(False)
+
+    actor_names = []
+    try:
+        with unreal.ScopedEditorTransaction('Spawn points'), unreal.ScopedSlowTask(len(points), 'Spawning points') as slow_task:
+            for pnt in points:
+                slow_task.enter_progress_frame(1)
+                actor_names.append(pnt.spawn_actor_from_class(blueprint_class))
+    finally:
+        if set_realtime is not None:
+            set_realtime(True)
+
+    return actor_names
+
+
 def create_colored_material_instances(unique_values, cmap: matplotlib.colors.Colormap, norm: matplotlib.colors.Normalize = None, mi_directory_path : str = '/Game/', mi_name_prefix: str = ''):
     
     ''' 
@@ -126,83 +180,134 @@ def create_colored_material_instances(unique_values, cmap: matplotlib.colors.Col
         [element for element in unique_values]
     except: 
         TypeError("Range of possible values are not iterable")
+
+    if norm is None:
+        # Check the values lie between zero and one.
+        raise NotImplementedError
+
+    # Evaluate the colormap for all of the values in one call
+    unique_values = list(unique_values)
+    rgbas = cmap(norm(np.asarray(unique_values)))
     
     material_dict = {}
     AssetTools = unreal.AssetToolsHelpers.get_asset_tools()
 
     # The material instance needs a parent in order to update properties. 
     # Hard coding to a simple opaque material whose color can be changed. 
-    base_mtl = unreal.EditorAssetLibrary.find_asset_data('/Engine/EngineDebugMaterials/M_SimpleOpaque')
+    base_mtl = unreal.EditorAssetLibrary.find_asset_data('/Engine/EngineDebugMaterials/M_SimpleOpaque').get_asset()
+
+    # List the assets already in the directory once, rather than checking 
+    # for each material in turn. Registry package paths have no trailing 
+    # slash.
+    asset_registry = unreal.AssetRegistryHelpers().get_asset_registry()
+    existing_assets = {str(asset.asset_name) for asset in asset_registry.get_assets_by_path(mi_directory_path.rstrip('/'), recursive=False)}
+
+    # Create materials for each RGBA value. The assets are created first and 
+    # the remaining editing steps are then applied to all of them in turn, 
+    # inside a single slow task so the editor does not update after every 
+    # call.
+    created = []
+    pending = []
+    with unreal.ScopedSlowTask(5, 'Creating material instances') as slow_task:
+        slow_task.enter_progress_frame(1)
+        for value, (r, g, b, a) in zip(unique_values, rgbas):
+            
+            unreal.log("Creating material for value %s" % value)
+            
+            # Convert value to unreal LinearColor object 
+            rgba = unreal.LinearColor(r=r, g=g, b=b, a=a)
+            
+            mi_name = mi_name_prefix + str(value)
+            
+            if mi_name in existing_assets:
+                asset = unreal.EditorAssetLibrary.load_asset(mi_directory_path + mi_name)
+                if isinstance(asset, unreal.MaterialInstanceConstant):
+                    # A material instance from a previous run can be reused. 
+                    # It only needs re-parenting if it is not based on 
+                    # base_mtl, and recoloring if its color has changed.
+                    material_dict[value] = asset
+                    if asset.get_editor_property('parent') != base_mtl:
+                        unreal.log('Updating parent of asset %s' % (mi_directory_path + mi_name))
+                        created.append(asset)
+                        pending.append((asset, rgba))
+                        continue
+                    current = unreal.MaterialEditingLibrary.get_material_instance_vector_parameter_value(asset, "Color")
+                    if not current.is_near_equal(rgba):
+                        unreal.log('Updating color of asset %s' % (mi_directory_path + mi_name))
+                        pending.append((asset, rgba))
+                    continue
+
+                # To ensure code idempotence, let's delete any existing assets 
+                # with the same name that are not material instances. Let's 
+                # log what every we end up deleting.
+                unreal.log_warning('Deleting asset %s' % (mi_directory_path + mi_name))
+                unreal.EditorAssetLibrary.delete_asset(mi_directory_path + mi_name)
+
+            # Now we can create the asset and set a series of materials. 
+            asset = AssetTools.create_asset(mi_name, mi_directory_path, unreal.MaterialInstanceConstant, unreal.MaterialInstanceConstantFactoryNew())        
+            material_dict[value] = asset
+            created.append(asset)
+            pending.append((asset, rgba))
 
-    # Create materials for each RGBA value
-    for value in unique_values:
-        
-        unreal.log("Creating material for value %s" % value)
-        
-        # Convert value to unreal LinearColor object 
-        if norm is None:
-            # Check the values lie between zero and one.
-            raise NotImplementedError
-
-        else:
-            rgba = unreal.LinearColor(r=cmap(norm(value))[0], g=cmap(norm(value))[1], b=cmap(norm(value))[2], a=cmap(norm(value))[3])
-        
-        mi_name = mi_name_prefix + str(value)
-        
-        if unreal.EditorAssetLibrary.does_asset_exist(mi_directory_path + mi_name):
-            # To ensure code idempotence, let's delete any existing materials 
-            # with the same name. This may cause problems if the names of 
-            # different materials are not changed so let's log what every we 
-            # end up deleting.
-            unreal.log_warning('Deleting asset %s' % (mi_directory_path + mi_name))
-            unreal.EditorAssetLibrary.delete_asset(mi_directory_path + mi_name)
-
-        # Now we can create the asset and set a series of materials. 
-        asset = AssetTools.create_asset(mi_name, mi_directory_path, unreal.MaterialInstanceConstant, unreal.MaterialInstanceConstantFactoryNew())        
         # Assign base_mtl
-        unreal.MaterialEditingLibrary.set_material_instance_parent(asset, base_mtl.get_asset() )
+        slow_task.enter_progress_frame(1)
+        for asset in created:
+            unreal.MaterialEditingLibrary.set_material_instance_parent(asset, base_mtl)
+        
         # Set color parameter
-        unreal.MaterialEditingLibrary.set_material_instance_vector_parameter_value(instance=asset, parameter_name="Color", value=rgba)
+        slow_task.enter_progress_frame(1)
+        for asset, rgba in pending:
+            unreal.MaterialEditingLibrary.set_material_instance_vector_parameter_value(instance=asset, parameter_name="Color", value=rgba)
         
         # Update and save
-        unreal.MaterialEditingLibrary.update_material_instance(asset)
-        unreal.EditorAssetLibrary.save_loaded_asset(asset)
-        
-        # Store the asset object for reference create Static Mesh Actors
-        material_dict[value] = asset
+        slow_task.enter_progress_frame(1)
+        for asset, rgba in pending:
+            unreal.MaterialEditingLibrary.update_material_instance(asset)
+        slow_task.enter_progress_frame(1)
+        if pending:
+            unreal.EditorAssetLibrary.save_loaded_assets([asset for asset, rgba in pending])
 
     return material_dict
 
 
-def create_legend_texture(unique_values, labels, cmap : matplotlib.colors.Colormap, norm : matplotlib.colors.Normalize, texture_path):
+def create_legend_texture(unique_values, labels, cmap : matplotlib.colors.Colormap, norm : matplotlib.colors.Normalize, texture_path, tasks : list):
     """
     Create a texture for use in a legend that can be added to a widget 
-    blueprint
+    blueprint. The values are shown in ascending order, with labels giving 
+    the text for each value in that order. The import task for the texture is
+    appended to tasks, to be run together with any other imports.
     """
-    ax = plt.subplot(111)
-    handles = []
-    for i in unique_values: 
-        handles.append(ax.plot([0], [0], 'o', color=cmap(norm(i))))
-    legend = ax.legend(labels)
-    fig = legend.figure
-    fig.canvas.draw()
-    expand = [-5,-5,5,5]
-    bbox = legend.get_window_extent()
-    bbox = bbox.from_extents(*(bbox.extents + np.array(expand)))
-    bbox = bbox.transformed(fig.dpi_scale_trans.inverted())
-    fig.savefig(unreal.Paths.project_content_dir() + texture_path, bbox_inches=bbox, dpi=600)
+    # Draw the legend directly with Pillow (installed alongside matplotlib): a
+    # colored marker and a label per row on a white, outlined background.
+    font = ImageFont.truetype(matplotlib.font_manager.findfont('DejaVu Sans'), 48)
+    row_height = 72
+    marker_size = 40
+    padding = 24
+    rows = list(zip(sorted(unique_values), labels))
+    text_width = max((font.getlength(label) for value, label in rows), default=0)
+    width = int(3 * padding + marker_size + text_width)
+    height = int(2 * padding + row_height * len(rows))
+
+    img = Image.new('RGBA', (width, height), (0, 0, 0, 0))
+    draw = ImageDraw.Draw(img)
+    draw.rounded_rectangle((0, 0, width - 1, height - 1), radius=padding // 2, fill='white', outline=(204, 204, 204), width=2)
+    for i, (value, label) in enumerate(rows):
+        top = padding + i * row_height
+        marker_top = top + (row_height - marker_size) // 2
+        draw.ellipse((padding, marker_top, padding + marker_size, marker_top + marker_size), fill=tuple(int(255 * c) for c in cmap(norm(value))))
+        draw.text((2 * padding + marker_size, top + row_height // 2), label, fill='black', font=font, anchor='lm')
+    img.save(unreal.Paths.project_content_dir() + texture_path)
     task = unreal.AssetImportTask()
     task.filename = unreal.Paths.project_content_dir() + texture_path
     task.destination_path = "/Game/" + texture_path
     task.replace_existing = True
     task.automated = True
     task.save = True
-    unreal.AssetToolsHelpers.get_asset_tools().import_asset_tasks([task])
-    os.remove(unreal.Paths.project_content_dir() + texture_path)
+    tasks.append(task)
 
 
-def import_point_display_text(csv_file_name, destination_path, data_table_struct_path):
-    # Import csv data into a datatable
+def import_point_display_text(csv_file_name, destination_path, data_table_struct_path, tasks : list):
+    # Queue the import of csv data into a datatable
     task = unreal.AssetImportTask()
     task.filename = csv_file_name
     task.destination_path = destination_path
@@ -212,7 +317,7 @@ def import_point_display_text(csv_file_name, destination_path, data_table_struct
     csv_factory = unreal.CSVImportFactory()
     csv_factory.automated_import_settings.import_row_struct = unreal.load_object(None, data_table_struct_path)
     task.factory = csv_factory
-    unreal.AssetToolsHelpers.get_asset_tools().import_asset_tasks([task])
+    tasks.append(task)
 
 
 if __name__=="__main__":
@@ -230,8 +335,11 @@ if __name__=="__main__":
     ue_world_origin_bng_northings = 180759
 
     # Data cleaning
-    df = df[df.RatingValue.isin(['1','2','3','4','5'])]
-    df['RatingValue'] = pd.to_numeric(df.loc[:, 'RatingValue'])
+    # Keep only the whole 1-5 ratings (dropping e.g. 'Exempt') and store 
+    # the repeated text columns as categories.
+    df = df.assign(RatingValue=pd.to_numeric(df['RatingValue'], errors='coerce'))\
+        .query('RatingValue in [1, 2, 3, 4, 5]')\
+        .astype({'RatingValue': 'int8', 'BusinessType': 'category', 'LocalAuthorityName': 'category'})
     
     # Define a norm and cmap
     norm = matplotlib.colors.Normalize(vmin=df['RatingValue'].min(), vmax=df['RatingValue'].max())
@@ -243,26 +351,52 @@ if __name__=="__main__":
     # Create colored materials
     material_dict = create_colored_material_instances(unique_values=unique_values, cmap=cmap, norm=norm, mi_directory_path='/Game/', mi_name_prefix='fsa_point_value_')
 
+    # Index the materials by the integer rating so they can be looked up by 
+    # position in the loop below.
+    materials_by_rating = [None] * (int(max(material_dict, default=0)) + 1)
+    for value, material in material_dict.items():
+        materials_by_rating[int(value)] = material
+
     # Initalise a list to store cursor over text display
-    actor_names = []
     csv_file_name = 'PointText.csv' # % str(uuid.uuid1())
 
-    with open(csv_file_name, 'w') as csvfile:
-        csvfile_writer = csv.writer(csvfile)
-        csvfile_writer.writerow(['Name', 'Text'])
-        # Plot data
-        for index, row in df.iterrows():
-            rgba = cmap(row['RatingValue'])
-            x_value = 100 * (row['Easting'] - ue_world_origin_bng_eastings) # Multiply by 100 since UE coordinates are measured in cm.
-            y_value = -1 * 100 * (row['Northing'] - ue_world_origin_bng_northings) # Multiply by 100 since UE coordinates are measured in cm. Multiple by minus 1 since the y-axis in UE is inverted.
-            pnt = UnrealPoint(index, x_value, y_value, z_value, 'FSA_point_')
-            pnt.material = material_dict[row['RatingValue']]
-            pnt.tags = ['fsa']
-            unreal_actor_name = pnt.spawn_actor_from_blueprint_class('/Game/Point_Blueprint')
-            csvfile_writer.writerow([unreal_actor_name, row['BusinessType'] + '\nRating Date: ' + row['RatingDate'] + '\n' + row['LocalAuthorityName']])
-
+    # Transform the coordinates for all points in one go. Multiply by 100 
+    # since UE coordinates are measured in cm, and multiply the y-axis by 
+    # minus 1 since the y-axis in UE is inverted.
+    xs = (df['Easting'].to_numpy() - ue_world_origin_bng_eastings) * 100.0
+    ys = (df['Northing'].to_numpy() - ue_world_origin_bng_northings) * -100.0
+
+    # Build every point first, so that all the spawning can happen in a 
+    # single batch. The columns are walked as plain Python lists, which avoids
+    # creating a pandas Series (iterrows) or NumPy scalar for every value.
+    columns = zip(df.index.tolist(), xs.tolist(), ys.tolist(),
+                  df['RatingValue'].tolist(), df['BusinessType'].tolist(),
+                  df['RatingDate'].tolist(), df['LocalAuthorityName'].tolist())
+    points = []
+    point_text = []
+    for index, x_value, y_value, rating, business_type, rating_date, local_authority in columns:
+        pnt = UnrealPoint(index, x_value, y_value, z_value, 'FSA_point_')
+        pnt.material = materials_by_rating[rating]
+        pnt.tags = ['fsa']
+        points.append(pnt)
+        point_text.append(f'{business_type}\nRating Date: {rating_date}\n{local_authority}')
+
+    # Plot data
+    actor_names = spawn_points_from_blueprint_class(points, '/Game/Point_Blueprint')
+
+    # Write the display text in one go now that all the actor names are known
+    text_rows = list(zip(actor_names, point_text))
+    with open(csv_file_name, 'w', newline='', buffering=1 << 20) as csvfile:
+        csv.writer(csvfile).writerows([['Name', 'Text'], *text_rows])
+
+    # Collect the import tasks so that they can all be run with one call
+    tasks = []
     # import the point display text into a datatable of the same name as the csv file with the structure given by PointLabelStruct
-    import_point_display_text(csv_file_name, '/Game/', '/Game/PointLabelStruct.PointLabelStruct')
-    os.remove(csv_file_name)
+    import_point_display_text(csv_file_name, '/Game/', '/Game/PointLabelStruct.PointLabelStruct', tasks)
     # Create legend and load as a texture in UE
-    create_legend_texture(unique_values=unique_values, labels=['1', '2', '3', '4', '5'], cmap=cmap, norm=norm, texture_path='DataTextures/crime_legend.png')
\ No newline at end of file
+    create_legend_texture(unique_values=unique_values, labels=[str(value) for value in sorted(unique_values)], cmap=cmap, norm=norm, texture_path='DataTextures/crime_legend.png', tasks=tasks)
+
+    unreal.AssetToolsHelpers.get_asset_tools().import_asset_tasks(tasks)
+    # The imported files are no longer needed once they are assets
+    for task in tasks:
+        os.remove(task.filename)
\ No newline at end of file
@@ -23,9 +23,26 @@ assets_location_offset_z = 0.0
 asset_registry = unreal.AssetRegistryHelpers().get_asset_registry()
 assets = asset_registry.get_assets_by_path(package_path=unreal_asset_directory_to_spawn)
 
-for asset in assets:
-    obj = unreal.EditorAssetLibrary.load_asset(asset.package_name)
-    obj_name = obj.get_name()
-    unreal.log("Spawning object %s" % obj_name)
-    loc = [assets_location_offset_x,assets_location_offset_y, assets_location_offset_z]
-    actor = unreal.EditorLevelLibrary().spawn_actor_from_object(obj, loc)
+loc = unreal.Vector(assets_location_offset_x, assets_location_offset_y, assets_location_offset_z)
+editor_level_library = unreal.EditorLevelLibrary()
+
+# Spawn everything in a single editor transaction with viewport realtime 
+# rendering switched off, where the engine version exposes that to Python, so
+# the viewport is not redrawn after each actor.
+level_editor = unreal.get_editor_subsystem(unreal.LevelEditorSubsystem)
+set_realtime = getattr(level_editor, 'set_level_viewport_realtime', None)
+if set_realtime is not None:
+    set_realtime(False)
+
+try:
+    with unreal.ScopedEditorTransaction('Spawn assets'):
+        for asset in assets:
+            # The asset data already holds the name, so there is no need to 
+            # ask the loaded object for it.
+            obj = asset.get_asset()
+            obj_name = str(asset.asset_name)
+            unreal.log("Spawning object %s" % obj_name)
+            actor = editor_level_library.spawn_actor_from_object(obj, loc)
+finally:
+    if set_realtime is not None:
+        set_realtime(True)
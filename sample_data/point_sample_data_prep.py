@@ -1,8 +1,8 @@
 import xml.etree.ElementTree as ET
 import pandas as pd
-import geopandas as gpd
 import datetime as dt
 from urllib.request import urlopen
+from pyproj import Transformer
 
 """
 Sample data is obtained from the UK Food Standards Agency Food Hyegience Rating Data API, available from: https://ratings.food.gov.uk/open-data/
@@ -11,29 +11,49 @@ Data is made avialable under the Open Government License (OGL) v3: https://www.n
 
 city_of_london_data_url = "https://ratings.food.gov.uk/OpenDataFiles/FHRS508en-GB.xml"
 
-# Read and format xml data
+establishment_fields = ["FHRSID", "BusinessType", "RatingValue", "RatingDate", "LocalAuthorityName"]
+score_fields = ["Hygiene", "Structural", "ConfidenceInManagement"]
+geocode_fields = ["Longitude", "Latitude"]
+
+# Read and format xml data. The download is streamed straight into a single 
+# parsing pass, with the establishment, score and geocode fields all taken 
+# from the same EstablishmentDetail element so that the rows always line up.
+# Each record is removed from the tree once read, so memory use does not grow
+# with the size of the file.
+est_rows = []
+score_rows = []
+geo_rows = []
 with urlopen(city_of_london_data_url) as f:
-    df = pd.read_xml(f, 
-                     parser='etree', 
-                     iterparse={"EstablishmentDetail": ["FHRSID", "BusinessType", "RatingValue", "RatingDate", "LocalAuthorityName"]})
-    
-with urlopen(city_of_london_data_url) as f:
-    df_scores = pd.read_xml(f, parser='etree', iterparse={"Scores":["Hygiene", "Structural", "ConfidenceInManagement"]})
-
-with urlopen(city_of_london_data_url) as f:
-    df_geocode = pd.read_xml(f, parser='etree', iterparse={"Geocode": ["Longitude", "Latitude"]})
-
-df = df.merge(df_scores, left_index=True, right_index=True)
-df = df.merge(df_geocode, left_index=True, right_index=True)
+    collection = None
+    for event, elem in ET.iterparse(f, events=('start', 'end')):
+        if event == 'start':
+            if elem.tag == 'EstablishmentCollection':
+                collection = elem
+        elif elem.tag == 'EstablishmentDetail':
+            est_rows.append({field: elem.findtext(field) for field in establishment_fields})
+            score_rows.append({field: elem.findtext('Scores/' + field) for field in score_fields})
+            geo_rows.append({field: elem.findtext('Geocode/' + field) for field in geocode_fields})
+            elem.clear()
+            if collection is not None:
+                collection.remove(elem)
+
+df = pd.concat([pd.DataFrame(est_rows, columns=establishment_fields), 
+                pd.DataFrame(score_rows, columns=score_fields), 
+                pd.DataFrame(geo_rows, columns=geocode_fields)], axis=1)
+
+# Everything is read as text, so convert the numeric columns
+for column in ["FHRSID"] + score_fields + geocode_fields:
+    df[column] = pd.to_numeric(df[column], errors='coerce')
 
 # Filter df to only include records with a geocode
-df = df[(~df['Latitude'].isna()) & (~df['Longitude'].isna())]
-
-# Add Eastings and Northings columns using a geopandas transformation
-df = gpd.GeoDataFrame(df, geometry=gpd.points_from_xy(df['Longitude'], df['Latitude']), crs=4326)
-df = df.to_crs(27700)
-df['Easting'] = df['geometry'].apply(lambda p: p.x)
-df['Northing'] = df['geometry'].apply(lambda p: p.y)
+df = df.dropna(subset=['Latitude', 'Longitude'])
+
+# Add Eastings and Northings columns by transforming the coordinates from 
+# WGS84 (EPSG:4326) to British National Grid (EPSG:27700)
+transformer = Transformer.from_crs(4326, 27700, always_xy=True)
+eastings, northings = transformer.transform(df['Longitude'].to_numpy(), df['Latitude'].to_numpy())
+df['Easting'] = eastings
+df['Northing'] = northings
 
 
 # Save file